@@ -1,7 +1,48 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 
 
+def _nanmean(values, mask):
+    """
+    Column means of a 2-D array ignoring NaNs, given its NaN mask.
+    """
+    counts = mask.shape[0] - np.count_nonzero(mask, axis=0)
+    # Columns with no values at all get a NaN mean, without a warning
+    with np.errstate(invalid='ignore'):
+        return np.where(mask, 0.0, values).sum(axis=0) / counts
+
+
+def _mode(column):
+    """
+    Most frequent non-missing value of a column.
+    If the mode is a tie, the lower value is picked, as with pandas mode.
+    """
+    values = column.dropna().to_numpy()
+    if values.size == 0:
+        return np.nan
+
+    # Non-negative integer codes: count them directly in one pass
+    if values.dtype.kind in "iuf" and 0 <= values.min() \
+            and values.max() <= values.size \
+            and np.array_equal(values, np.floor(values)):
+        return np.bincount(values.astype(np.int64)).argmax()
+
+    # Unordered categories cannot be compared to break ties, so let
+    # pandas pick the mode of category columns
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.mode()[0]
+
+    # Otherwise fall back on the hash-table based value counts
+    counts = column.value_counts(dropna=True)
+    try:
+        return counts.index[counts.to_numpy() == counts.iloc[0]].min()
+    except TypeError:
+        # Tied values of mixed types cannot be compared, let pandas pick
+        return column.mode()[0]
+
+
 def fill_missing(X_train, X_test, column_dict, num_imp, cat_imp):
     """
     Fill missing values in the dataframe based on user input.
@@ -49,9 +90,8 @@ def fill_missing(X_train, X_test, column_dict, num_imp, cat_imp):
         "X_train and X_test must have the same columns"
 
     # Check dictionary keys are numeric and categorical
-    for key in column_dict.keys():
-        assert key == 'numeric' or key == 'categorical', \
-            "column_dict keys can be only 'numeric' and 'categorical'"
+    assert set(column_dict) <= {'numeric', 'categorical'}, \
+        "column_dict keys can be only 'numeric' and 'categorical'"
 
     # Check all the columns in df are named
     assert not isinstance(X_train.columns, pd.RangeIndex), \
@@ -60,10 +100,8 @@ def fill_missing(X_train, X_test, column_dict, num_imp, cat_imp):
         "column names must be strings"
 
     # Check all the columns listed in dictionary are in the df
-    for keys, values in column_dict.items():
-        for column in values:
-            assert column in X_train.columns, \
-                "columns in dictionary must be in dataframe"
+    assert {column for values in column_dict.values() for column in values} \
+        <= set(X_train.columns), "columns in dictionary must be in dataframe"
 
     # Check that numerical imputation method is one of the two options
     assert num_imp == "mean" or num_imp == "median", \
@@ -72,35 +110,62 @@ def fill_missing(X_train, X_test, column_dict, num_imp, cat_imp):
     # Check that categorical imputation method is the only option
     assert cat_imp == "mode", "cat_imp can only take 'mode' as argument value"
 
+    numeric = column_dict['numeric']
+    categorical = column_dict['categorical']
+
     # Imputation methods for numerical transforms
-    for column in column_dict['numeric']:
-        # get column mean or median
-        if num_imp == "mean":
-            col_imp = X_train[column].mean()
-        if num_imp == "median":
-            col_imp = X_train[column].median()
-
-        # Get index of NaN values in train columns
-        index_train = X_train[column].index[X_train[column].apply(np.isnan)]
-        index_test = X_test[column].index[X_test[column].apply(np.isnan)]
-
-        # Use impute value on train set
-        X_train.loc[index_train, column] = col_imp
-        # Use same impute value on test set
-        X_test.loc[index_test, column] = col_imp
+    if numeric:
+        # Work on one 2-D float array per set rather than column by column
+        train_num = X_train[numeric].to_numpy(dtype=float)
+        test_num = X_test[numeric].to_numpy(dtype=float)
+        train_mask = np.isnan(train_num)
+        test_mask = np.isnan(test_num)
+
+        # Only columns missing values in either set need an impute value
+        needed = train_mask.any(axis=0) | test_mask.any(axis=0)
+        if needed.any():
+            num_imp_values = np.full(len(numeric), np.nan)
+            if num_imp == "mean":
+                num_imp_values[needed] = _nanmean(train_num[:, needed],
+                                                  train_mask[:, needed])
+            if num_imp == "median":
+                # All-NaN columns get a NaN median, without a warning
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    num_imp_values[needed] = np.nanmedian(
+                        train_num[:, needed], axis=0)
+
+            # Copy out only the columns that have missing values, write
+            # the impute values into their NaN slots, and put them back
+            # with their original dtypes
+            for X, values, mask in ((X_train, train_num, train_mask),
+                                    (X_test, test_num, test_mask)):
+                changed = mask.any(axis=0)
+                if changed.any():
+                    block = values[:, changed]
+                    np.copyto(block, num_imp_values[changed],
+                              where=mask[:, changed])
+                    columns = [c for c, m in zip(numeric, changed) if m]
+                    X[columns] = pd.DataFrame(
+                        block, index=X.index, columns=columns,
+                        copy=False).astype(X[columns].dtypes)
 
     # Imputation methods for categorical transforms
-    for column in column_dict['categorical']:
-        # Note:  If mode is a tie, pandas picks the lower value!
-        col_imp = X_train[column].mode()[0]
-
-        # Get index of NaN values in train columns
-        index_train = X_train[column].index[X_train[column].isnull()]
-        index_test = X_test[column].index[X_test[column].isnull()]
-
-        # Use impute value on train set
-        X_train.loc[index_train, column] = col_imp
-        # Use same impute value on test set
-        X_test.loc[index_test, column] = col_imp
+    # Find the columns missing values with one isna call per set
+    needed = X_train[categorical].isna().to_numpy().any(axis=0) \
+        | X_test[categorical].isna().to_numpy().any(axis=0)
+    missing = [c for c, m in zip(categorical, needed) if m]
+    if missing:
+        fill_values = {column: _mode(X_train[column]) for column in missing}
+
+        # Category columns of the test set may not list the train mode
+        for column, value in fill_values.items():
+            if isinstance(X_test[column].dtype, pd.CategoricalDtype) \
+                    and value not in X_test[column].cat.categories:
+                X_test[column] = X_test[column].cat.add_categories([value])
+
+        # Use impute values on train set, and same values on test set
+        X_train.fillna(fill_values, inplace=True)
+        X_test.fillna(fill_values, inplace=True)
 
     return {"X_train": X_train, "X_test": X_test}
@@ -2,12 +2,73 @@ import pandas as pd
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.preprocessing import MinMaxScaler, OrdinalEncoder
 from sklearn.compose import ColumnTransformer
+from sklearn.utils import assert_all_finite
+from scipy import sparse as sp
 import numpy as np
 
+# Scalers for numeric columns and encoders for categorical columns,
+# with their transformer names and constructor arguments
+_SCALERS = {"standard_scaling": ("stand_scaler", StandardScaler),
+            "minmax_scaling": ("minmax_scaler", MinMaxScaler)}
+_ENCODERS = {"onehot_encoding": ("ohe", OneHotEncoder, {'drop': 'first'}),
+             "label_encoding": ("ordinal", OrdinalEncoder, {})}
+
+
+def _to_frame(values, index, columns, n_dense=0):
+    """
+    Wraps transformed values in a dataframe. Sparse output keeps its
+    first n_dense columns dense and the remaining columns sparse.
+    """
+    if sp.issparse(values):
+        # Build the sparse columns one by one so they keep a fill value
+        # of 0, which DataFrame.sparse.from_spmatrix does not guarantee
+        values = values.tocsc()
+        return pd.DataFrame(
+            {column: values[:, i].toarray().ravel() if i < n_dense
+             else pd.arrays.SparseArray.from_spmatrix(values[:, [i]])
+             for i, column in enumerate(columns)}, index=index)
+    return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+def _assemble(scaler, encoder, X, numeric, categorical, dtype):
+    """
+    Transforms X into one preallocated array, holding the scaled numeric
+    block followed by the encoded categorical block.
+    """
+    n_numeric = len(numeric)
+    encoded = encoder.transform(X[categorical]) if categorical \
+        else np.empty((len(X), 0), dtype=dtype)
+
+    # Fortran order matches the column-wise layout pandas uses, so the
+    # array is later wrapped in a dataframe without being copied
+    out = np.empty((len(X), n_numeric + encoded.shape[1]), dtype=dtype,
+                   order='F')
+
+    # Scale each numeric column straight into its output column, so the
+    # numeric block of X is never copied out as a whole. Columns are
+    # checked the same way the scalers check their input
+    for i, column in enumerate(numeric):
+        values = X[column].to_numpy(dtype=np.float64)
+        assert_all_finite(values, allow_nan=True)
+        if isinstance(scaler, StandardScaler):
+            np.subtract(values, scaler.mean_[i], out=out[:, i])
+            np.divide(out[:, i], scaler.scale_[i], out=out[:, i])
+        else:
+            np.multiply(values, scaler.scale_[i], out=out[:, i])
+            np.add(out[:, i], scaler.min_[i], out=out[:, i])
+
+    if sp.issparse(encoded):
+        encoded.toarray(out=out[:, n_numeric:])
+    else:
+        out[:, n_numeric:] = encoded
+
+    return out
+
 
 def transform_columns(X_train, X_test, column_dict,
                       cat_trans="onehot_encoding",
-                      num_trans="standard_scaling"):
+                      num_trans="standard_scaling", n_jobs=None,
+                      sparse=False, dtype=np.float64, categories=None):
     """
     Transforms categorical and numerical features based on user input.
 
@@ -25,6 +86,22 @@ def transform_columns(X_train, X_test, column_dict,
     num_trans: list
         transformation method for numerical features
         (default - 'StandardScaler')
+    n_jobs: int
+        number of jobs to run the transformations in parallel,
+        -1 uses all processors (default - None, no parallelism)
+    sparse: bool
+        whether to keep onehot encoded columns sparse, returning them
+        as sparse columns while numeric columns stay dense
+        (default - False)
+    dtype: numpy dtype
+        float dtype of the transformed values, np.float32 halves
+        the memory used by the output (default - np.float64)
+    categories: dictionary
+        A dictionary with keys = categorical column names and values =
+        a sorted list of the categories of each column, all values in
+        X_train and X_test must be listed. Skips finding the categories
+        from X_train, e.g. when the same columns are transformed for
+        several folds (default - None, categories found from X_train)
 
     Returns
     -------
@@ -59,9 +136,8 @@ def transform_columns(X_train, X_test, column_dict,
     assert len(column_dict) == 2, \
         "column_dict should have 2 keys - 'numeric' and 'categorical'"
 
-    for key in column_dict.keys():
-        assert key in ['numeric', 'categorical'],\
-            "column_dict keys can be only 'numeric' and 'categorical'"
+    assert set(column_dict) <= {'numeric', 'categorical'},\
+        "column_dict keys can be only 'numeric' and 'categorical'"
 
     # assertions for transformation inputs
     assert isinstance(num_trans, str), "num_trans should be a string"
@@ -72,71 +148,82 @@ def transform_columns(X_train, X_test, column_dict,
     assert cat_trans == "onehot_encoding" or cat_trans == "label_encoding",\
         "transformation method for categorical columns can only be" \
         " 'label_encoding' or 'onehot_encoding'"
+    assert n_jobs is None or isinstance(n_jobs, int), \
+        "n_jobs should be an integer or None"
+    assert isinstance(sparse, bool), "sparse should be a boolean"
+    assert np.dtype(dtype).kind == 'f', "dtype should be a float dtype"
+    assert categories is None or isinstance(categories, dict), \
+        "categories should be a python dictionary"
 
     # Check train set and test set columns are the same
     assert np.array_equal(X_train.columns, X_test.columns),\
         "X_train and X_test must have the same columns"
 
-    for key, values in column_dict.items():
-        for column in values:
-            assert column in X_train.columns,\
-                "columns in dictionary must be in dataframe"
+    assert {column for values in column_dict.values() for column in values} \
+        <= set(X_train.columns), "columns in dictionary must be in dataframe"
 
     numeric = column_dict['numeric']
     categorical = column_dict['categorical']
 
-    if cat_trans == 'onehot_encoding':
-
-        if num_trans == "standard_scaling":
-            preprocessor = ColumnTransformer(transformers=[
-                ("stand_scaler", StandardScaler(), numeric),
-                ("ohe", OneHotEncoder(drop='first'), categorical)],
-                sparse_threshold=0)
-
-        if num_trans == "minmax_scaling":
-            preprocessor = ColumnTransformer(transformers=[
-                ("minmax_scaler", MinMaxScaler(), numeric),
-                ("ohe", OneHotEncoder(drop='first'), categorical)],
-                sparse_threshold=0)
-            # print(2)
-
-        # Applying transformations to training data set
-        X_train = pd.DataFrame(preprocessor.fit_transform(X_train),
-                               index=X_train.index,
-                               columns=numeric + list(
-            preprocessor.named_transformers_['ohe'].get_feature_names(
-                                       categorical)))
-
-        # applying transformations to test set
-        X_test = pd.DataFrame(preprocessor.transform(X_test),
-                              index=X_test.index,
-                              columns=X_train.columns)
+    # Scaler for numeric columns and encoder for categorical columns
+    name, scaler = _SCALERS[num_trans]
+    encoder_name, encoder, encoder_args = _ENCODERS[cat_trans]
+    if categories is not None:
+        assert set(categorical) <= set(categories), \
+            "categories must be given for every categorical column"
+        encoder_args = dict(encoder_args, categories=[
+            categories[column] for column in categorical])
+    encoder = encoder(dtype=dtype, **encoder_args)
+
+    if sparse or not (n_jobs is None or n_jobs == 1):
+        # ColumnTransformer stacks sparse output and runs the transformers
+        # in parallel, with one scaler per column so that the scaling work
+        # is spread across the jobs
+        if n_jobs is None or n_jobs == 1:
+            num_transformers = [(name, scaler(), numeric)]
+        else:
+            num_transformers = [(name + "_" + str(i), scaler(), [column])
+                                for i, column in enumerate(numeric)]
+
+        preprocessor = ColumnTransformer(transformers=num_transformers + [
+            (encoder_name, encoder, categorical)],
+            sparse_threshold=1.0 if sparse else 0, n_jobs=n_jobs)
+
+        # The scalers keep float32 input as float32, so cast the numeric
+        # columns up front instead of casting a float64 result afterwards
+        if np.dtype(dtype) != np.float64:
+            X_train = X_train.astype({column: dtype for column in numeric})
+            X_test = X_test.astype({column: dtype for column in numeric})
+
+        # Applying transformations to training and test set
+        Xt_train = preprocessor.fit_transform(X_train).astype(dtype,
+                                                              copy=False)
+        Xt_test = preprocessor.transform(X_test).astype(dtype, copy=False)
+        encoder = preprocessor.named_transformers_[encoder_name]
+
+    else:
+        # Fit the transformers on the training set directly, then write
+        # both blocks of each set into a single preallocated array
+        scaler = scaler()
+        if numeric:
+            scaler.fit(X_train[numeric])
+        if categorical:
+            encoder.fit(X_train[categorical])
+
+        Xt_train = _assemble(scaler, encoder, X_train, numeric, categorical,
+                             dtype)
+        Xt_test = _assemble(scaler, encoder, X_test, numeric, categorical,
+                            dtype)
 
+    if cat_trans == 'onehot_encoding':
+        columns = np.concatenate([np.asarray(numeric, dtype=object),
+                                  encoder.get_feature_names_out(categorical)])
     if cat_trans == "label_encoding":
+        columns = numeric + categorical
 
-        if num_trans == "standard_scaling":
-            preprocessor = ColumnTransformer(transformers=[
-                ("stand_scaler", StandardScaler(), numeric),
-                ("ordinal", OrdinalEncoder(), categorical)],
-                sparse_threshold=0)
-            # print(3)
-
-        if num_trans == "minmax_scaling":
-            preprocessor = ColumnTransformer(transformers=[
-                ("minmax_scaler", MinMaxScaler(), numeric),
-                ("ordinal", OrdinalEncoder(), categorical)],
-                sparse_threshold=0)
-            # print(4)
-
-        # ## Applying transformations to training data set
-        X_train = pd.DataFrame(preprocessor.fit_transform(X_train),
-                               index=X_train.index,
-                               columns=numeric + categorical)
-
-        # applying transformations to test set
-        X_test = pd.DataFrame(preprocessor.transform(X_test),
-                              index=X_test.index,
-                              columns=X_train.columns)
+    # Scaled numeric columns have few zeros, so only encoded ones stay sparse
+    X_train = _to_frame(Xt_train, X_train.index, columns, len(numeric))
+    X_test = _to_frame(Xt_test, X_test.index, X_train.columns, len(numeric))
 
     transformed_dict = {'X_train': X_train,
                         'X_test': X_test}
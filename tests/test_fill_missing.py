@@ -1,3 +1,4 @@
+import warnings
 from pylaundry.fill_missing import fill_missing
 import pandas as pd
 import numpy as np
@@ -335,3 +336,138 @@ def test_bad_dict_keys():
 
     except AssertionError:
         pass
+
+
+"""
+Testing that columns without missing values
+are left untouched, including their dtype
+"""
+
+
+def test_no_missing_untouched():
+    output = fill_missing(X_train=pd.DataFrame({
+        'cat1': [1, 2, 2, 1, 1],
+        'num1': [1, 2, 3, 4, 5],
+        'num2': [1.5, 2.5, 3.5, None, 4.5],
+        'num3': np.array([1.5, None, 2.5, 3.5, 4.5], dtype=np.float32)
+    }),
+        X_test=pd.DataFrame({
+            'cat1': [1, 2, 1],
+            'num1': [1, 2, 3],
+            'num2': [1.5, 2.5, 3.5],
+            'num3': np.array([None, 1.5, 2.5], dtype=np.float32)
+        }),
+        column_dict={'numeric': ['num1', 'num2', 'num3'],
+                     'categorical': ['cat1']},
+        num_imp="mean",
+        cat_imp="mode")
+    train_output = output['X_train']
+    test_output = output['X_test']
+
+    assert train_output["num1"].dtype == np.int64, \
+        "Numeric column without NaNs should keep its dtype"
+    assert train_output["cat1"].dtype == np.int64, \
+        "Categorical column without NaNs should keep its dtype"
+    assert train_output["num2"][3] == 3, \
+        "Imputed mean value should be 3.0 in train set"
+    assert test_output["num2"].tolist() == [1.5, 2.5, 3.5], \
+        "Test set without NaNs should be unchanged"
+    assert train_output["num3"].dtype == np.float32, \
+        "Imputed float32 column should keep its dtype in train set"
+    assert test_output["num3"].dtype == np.float32, \
+        "Imputed float32 column should keep its dtype in test set"
+    assert train_output["num3"][1] == 3, \
+        "Imputed mean value should be 3.0 in float32 column"
+
+
+"""
+Testing that ties in mode imputation
+pick the lower value
+"""
+
+
+def test_mode_tie():
+    output = fill_missing(X_train=pd.DataFrame({
+        'cat1': [3, 3, 2, 2, None],
+        'cat2': ['b', 'a', 'a', 'b', None]
+    }),
+        X_test=pd.DataFrame({
+            'cat1': [None, 1],
+            'cat2': [None, 'a']
+        }),
+        column_dict={'numeric': [],
+                     'categorical': ['cat1', 'cat2']},
+        num_imp="mean",
+        cat_imp="mode")
+    train_output = output['X_train']
+    test_output = output['X_test']
+
+    assert train_output["cat1"][4] == 2, \
+        "Tied mode should impute the lower value 2 in train set"
+    assert test_output["cat1"][0] == 2, \
+        "Tied mode should impute the lower value 2 in test set"
+    assert train_output["cat2"][4] == 'a', \
+        "Tied mode should impute the lower value 'a' in train set"
+
+    output = fill_missing(X_train=pd.DataFrame({
+        'cat1': pd.Categorical(['b', 'a', 'a', 'b', None])
+    }),
+        X_test=pd.DataFrame({
+            'cat1': pd.Categorical(['b', None])
+        }),
+        column_dict={'numeric': [],
+                     'categorical': ['cat1']},
+        num_imp="mean",
+        cat_imp="mode")
+
+    assert output['X_train']["cat1"][4] == 'a', \
+        "Tied mode of a category column should impute 'a' in train set"
+    assert output['X_test']["cat1"][1] == 'a', \
+        "Tied mode of a category column should impute 'a' in test set"
+
+    output = fill_missing(X_train=pd.DataFrame({
+        'cat1': ['a', 1, 'a', 1, None]
+    }),
+        X_test=pd.DataFrame({
+            'cat1': [None, 'a']
+        }),
+        column_dict={'numeric': [],
+                     'categorical': ['cat1']},
+        num_imp="mean",
+        cat_imp="mode")
+
+    assert output['X_train']["cat1"][4] == 1, \
+        "Tied mode of a mixed type column should impute 1 in train set"
+    assert output['X_test']["cat1"][0] == 1, \
+        "Tied mode of a mixed type column should impute 1 in test set"
+
+
+"""
+Testing that an all NaN train column is imputed
+with NaN and no warning
+"""
+
+
+def test_all_nan_column():
+    for num_imp in ["mean", "median"]:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            output = fill_missing(X_train=pd.DataFrame({
+                'num1': [np.nan, np.nan, np.nan],
+                'num2': [1.5, None, 2.5]
+            }),
+                X_test=pd.DataFrame({
+                    'num1': [1.5, None],
+                    'num2': [None, 2.5]
+                }),
+                column_dict={'numeric': ['num1', 'num2'],
+                             'categorical': []},
+                num_imp=num_imp,
+                cat_imp="mode")
+
+        assert np.isnan(output['X_train']["num1"]).all(), \
+            "All NaN train column should stay NaN in train set"
+        assert np.isnan(output['X_test']["num1"][1]), \
+            "All NaN train column should impute NaN in test set"
+        assert output['X_test']["num2"][0] == 2, \
+            "Imputed value should be 2.0 in test set"
@@ -360,3 +360,182 @@ def test_output():
     for key in output_dict.keys():
         assert key in ['X_train', 'X_test'], \
             "output_dict keys can be only 'X_test' and 'X_train'"
+
+
+def test_n_jobs():
+    """
+    Tests if transform_columns gives the same output in parallel
+    Arguments
+    --------
+    N/A
+    """
+    serial = transform_columns(X_train, X_test, column_dict)
+    parallel = transform_columns(X_train, X_test, column_dict, n_jobs=2)
+
+    assert serial['X_train'].equals(parallel['X_train']), \
+        "Parallel transformation of X_train must match serial output"
+    assert serial['X_test'].equals(parallel['X_test']), \
+        "Parallel transformation of X_test must match serial output"
+
+    try:
+        transform_columns(X_train, X_test, column_dict, n_jobs='all')
+
+    except AssertionError:
+        pass
+
+
+def test_sparse():
+    """
+    Tests if transform_columns keeps onehot encoded output sparse
+    Arguments
+    --------
+    N/A
+    """
+    dense = transform_columns(X_train, X_test, column_dict)
+    output = transform_columns(X_train, X_test, column_dict, sparse=True)
+
+    n_numeric = len(column_dict['numeric'])
+    for key in ['X_train', 'X_test']:
+        dtypes = output[key].dtypes
+        assert not any(isinstance(dtype, pd.SparseDtype)
+                       for dtype in dtypes[:n_numeric]), \
+            "Numeric columns must stay dense when sparse=True"
+        assert all(isinstance(dtype, pd.SparseDtype)
+                   for dtype in dtypes[n_numeric:]), \
+            "Onehot encoded columns must be sparse when sparse=True"
+        assert np.allclose(output[key].to_numpy(dtype=float), dense[key]), \
+            "Sparse output must hold the same values as dense output"
+
+    try:
+        transform_columns(X_train, X_test, column_dict, sparse='yes')
+
+    except AssertionError:
+        pass
+
+
+def test_inputs_unchanged():
+    """
+    Tests if transform_columns leaves its input dataframes untouched
+    Arguments
+    --------
+    N/A
+    """
+    train = pd.DataFrame({'a': [1.0, 2.0, 3.0],
+                          'b': [0.5, 1.5, 2.5],
+                          'c': ['x', 'y', 'x']})
+    test = pd.DataFrame({'a': [4.0, 5.0],
+                         'b': [3.5, 4.5],
+                         'c': ['y', 'y']})
+    train_copy = train.copy()
+    test_copy = test.copy()
+
+    for num_trans in ['standard_scaling', 'minmax_scaling']:
+        transform_columns(train, test,
+                          {'numeric': ['a', 'b'], 'categorical': ['c']},
+                          num_trans=num_trans)
+
+        assert train.equals(train_copy), \
+            "X_train must not be modified by transform_columns"
+        assert test.equals(test_copy), \
+            "X_test must not be modified by transform_columns"
+
+
+def test_dtype():
+    """
+    Tests if transform_columns returns values of the requested dtype
+    Arguments
+    --------
+    N/A
+    """
+    for cat_trans in ['onehot_encoding', 'label_encoding']:
+        default = transform_columns(X_train, X_test, column_dict,
+                                    cat_trans=cat_trans)
+        for n_jobs in [None, 2]:
+            output = transform_columns(X_train, X_test, column_dict,
+                                       cat_trans=cat_trans, n_jobs=n_jobs,
+                                       dtype=np.float32)
+
+            for key in ['X_train', 'X_test']:
+                assert (default[key].dtypes == np.float64).all(), \
+                    "Transformed values must be float64 by default"
+                assert (output[key].dtypes == np.float32).all(), \
+                    "Transformed values must be float32 with " \
+                    "dtype=np.float32"
+                assert np.allclose(output[key], default[key], atol=1e-6), \
+                    "float32 output must match float64 output"
+
+    try:
+        transform_columns(X_train, X_test, column_dict, dtype=np.int64)
+
+    except AssertionError:
+        pass
+
+
+def test_categories():
+    """
+    Tests if transform_columns uses the categories given by the user
+    Arguments
+    --------
+    N/A
+    """
+    categories = {'sex': ['F', 'M'],
+                  'manager': ['M1', 'M2', 'M3']}
+
+    for cat_trans in ['onehot_encoding', 'label_encoding']:
+        found = transform_columns(X_train, X_test, column_dict,
+                                  cat_trans=cat_trans)
+        given = transform_columns(X_train, X_test, column_dict,
+                                  cat_trans=cat_trans,
+                                  categories=categories)
+
+        assert given['X_train'].equals(found['X_train']), \
+            "Given categories must give the same X_train as found ones"
+        assert given['X_test'].equals(found['X_test']), \
+            "Given categories must give the same X_test as found ones"
+
+    # bad input type
+    try:
+        transform_columns(X_train, X_test, column_dict,
+                          categories=['F', 'M'])
+
+    except AssertionError:
+        pass
+
+    # missing categorical column
+    try:
+        transform_columns(X_train, X_test, column_dict,
+                          categories={'sex': ['F', 'M']})
+
+    except AssertionError:
+        pass
+
+
+def test_numeric_validation():
+    """
+    Tests if transform_columns checks numeric columns the same way
+    with and without parallel jobs
+    Arguments
+    --------
+    N/A
+    """
+    train = X_train.astype({'age': object})
+    test = X_test.astype({'age': object})
+
+    serial = transform_columns(train, test, column_dict)
+    parallel = transform_columns(train, test, column_dict, n_jobs=2)
+
+    assert serial['X_train'].equals(parallel['X_train']), \
+        "Object dtype numeric columns must be scaled as in parallel"
+    assert serial['X_test'].equals(parallel['X_test']), \
+        "Object dtype numeric columns must be scaled as in parallel"
+
+    # infinite values in the test set
+    test = X_test.astype({'age': float})
+    test.loc[0, 'age'] = np.inf
+    for n_jobs in [None, 2]:
+        try:
+            transform_columns(X_train, test, column_dict, n_jobs=n_jobs)
+            assert False, "Infinite values in X_test must raise an error"
+
+        except ValueError:
+            pass